@@ -4,36 +4,186 @@
 
 Usage:
     python batch_scrape_parental_guide.py
-    python batch_scrape_parental_guide.py --delay 5
+    python batch_scrape_parental_guide.py --rate 1
     python batch_scrape_parental_guide.py --start-index 50
+    python batch_scrape_parental_guide.py --concurrency 1  # 串行爬取，支持检查点
 """
 
-import json
+import asyncio
+import mmap
 import os
-import random
+import pickle
 import re
-import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
-from imdb_parental_guide_scraper import IMDBParentalGuideScraper, save_to_json
+import orjson
+
+from imdb_parental_guide_scraper import (
+    IMDBParentalGuideScraper,
+    parse_html,
+    save_to_json,
+)
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+
+IMDB_ID_PATTERN = re.compile(rb'"imdbId":\s*"(tt\d+)"')
+
+
+def _scan_imdb_ids(file_path: str) -> list[str]:
+    """通过 mmap 流式匹配 imdbId，不把整个文件读入内存"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [m.group(1).decode() for m in IMDB_ID_PATTERN.finditer(mm)]
 
 
 def extract_imdb_ids_from_movies_ts(file_path: str) -> list[str]:
-    """从 movies.ts 提取所有 imdbId"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """
+    从 movies.ts 提取所有 imdbId
+
+    结果以 (mtime, ids) 缓存到同目录的 <name>.imdbids.cache，文件未修改时直接读取缓存
+    """
+    cache_path = Path(file_path).with_suffix(".imdbids.cache")
+    mtime = os.path.getmtime(file_path)
+
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_mtime, ids = pickle.load(f)
+            if cached_mtime == mtime:
+                return ids
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+
+    ids = _scan_imdb_ids(file_path)
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((mtime, ids), f)
+    except OSError as e:
+        print(f"警告: 无法写入缓存 {cache_path}: {e}")
+
+    return ids
+
+
+def guide_output_path(output_dir: str, imdb_id: str) -> str:
+    """单个电影家长指南的输出路径"""
+    return os.path.join(output_dir, f"{imdb_id}_parental_guide.json")
+
+
+def load_existing_guide(output_path: str) -> Optional[dict]:
+    """读取已爬取的结果文件，不存在、已损坏或内容为空时返回 None（需要重新爬取）"""
+    try:
+        with open(output_path, 'rb') as f:
+            guide = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+    # 同意页或未解码的响应会解析出空结果，不能当作已爬取
+    if not isinstance(guide, dict):
+        return None
+    if guide.get("title") or any(
+        (guide.get(category) or {}).get("items")
+        for category in IMDBParentalGuideScraper.CATEGORY_IDS
+    ):
+        return guide
+    return None
+
+
+def save_summary(output_dir: str, total: int, results: list[dict], failed: list[dict]):
+    """保存最终结果汇总"""
+    summary_path = os.path.join(output_dir, "scrape_summary.json")
+    with open(summary_path, 'wb') as f:
+        f.write(orjson.dumps({
+            "total": total,
+            "success": len(results),
+            "failed_count": len(failed),
+            "failed": failed
+        }, option=orjson.OPT_INDENT_2))
+
+
+def load_checkpoint(checkpoint_path: str) -> tuple[set[str], list[dict], list[dict]]:
+    """
+    线性扫描 JSONL 检查点，恢复已处理的 IMDb ID、成功和失败列表
+
+    检查点按 ID 而非列表位置记录：并发爬取时记录是乱序写入的，
+    且 movies.ts 新增电影后排序位置会变化
+
+    Returns:
+        (已处理 ID 集合, results, failed)
+    """
+    done = set()
+    results = []
+    failed = []
+
+    with open(checkpoint_path, 'rb') as f:
+        for line in f:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # 进程中断时最后一行可能不完整
+                continue
+
+            done.add(record["imdb_id"])
+            if record["status"] in ("ok", "cached"):
+                results.append({
+                    "imdb_id": record["imdb_id"],
+                    "status": "success" if record["status"] == "ok" else "cached",
+                    "title": record.get("title", "")
+                })
+            else:
+                failed.append({"imdb_id": record["imdb_id"], "error": record.get("error", "")})
+
+    # 同一 ID 可能被多次记录：成功优先，失败只保留最后一次
+    results = list({r["imdb_id"]: r for r in results}.values())
+    succeeded = {r["imdb_id"] for r in results}
+    failed = list({f["imdb_id"]: f for f in failed if f["imdb_id"] not in succeeded}.values())
+
+    return done, results, failed
+
+
+def open_checkpoint(checkpoint_path: str):
+    """以追加模式打开检查点，上次中断留下的不完整行先用换行结束"""
+    checkpoint = open(checkpoint_path, 'ab')
+    if checkpoint.tell() > 0:
+        with open(checkpoint_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                checkpoint.write(b"\n")
+    return checkpoint
+
+
+def record_outcome(
+    checkpoint,
+    results: list[dict],
+    failed: list[dict],
+    i: int,
+    imdb_id: str,
+    title: str = "",
+    error: str = None,
+    cached: bool = False
+):
+    """记录单个电影的爬取结果（cached 表示结果文件已存在），并追加一行到检查点"""
+    if error is None:
+        results.append({"imdb_id": imdb_id, "status": "cached" if cached else "success", "title": title})
+        record = {"i": i, "imdb_id": imdb_id, "status": "cached" if cached else "ok", "title": title}
+    else:
+        failed.append({"imdb_id": imdb_id, "error": error})
+        record = {"i": i, "imdb_id": imdb_id, "status": "fail", "error": error}
 
-    # 匹配所有 imdbId
-    pattern = r'"imdbId":\s*"(tt\d+)"'
-    return re.findall(pattern, content)
+    checkpoint.write(orjson.dumps(record) + b"\n")
+    checkpoint.flush()
 
 
 def batch_scrape(
     imdb_ids: list[str],
     output_dir: str,
-    delay: float = 3.0,
+    rate: float = 2.0,
     start_index: int = 0,
-    checkpoint_file: str = "checkpoint.json"
+    checkpoint_file: str = CHECKPOINT_FILE
 ):
     """
     批量爬取家长指南
@@ -41,76 +191,167 @@ def batch_scrape(
     Args:
         imdb_ids: IMDb ID 列表
         output_dir: 输出目录
-        delay: 请求间隔（避免被封）
+        rate: 每秒最大请求数（令牌桶限速，遇到 429 自动降速）
         start_index: 起始索引（用于断点续爬）
-        checkpoint_file: 检查点文件
+        checkpoint_file: 检查点文件（JSONL，每处理一个电影追加一行）
     """
     os.makedirs(output_dir, exist_ok=True)
-    scraper = IMDBParentalGuideScraper(timeout=30, max_retries=3)
+    scraper = IMDBParentalGuideScraper(timeout=30, max_retries=3, rate=rate)
 
     results = []
     failed = []
+    done = set()
 
-    # 加载已有的检查点
+    # 加载已有的检查点，跳过已处理的 ID
     checkpoint_path = os.path.join(output_dir, checkpoint_file)
     if os.path.exists(checkpoint_path) and start_index == 0:
-        with open(checkpoint_path, 'r', encoding='utf-8') as f:
-            checkpoint = json.load(f)
-            start_index = checkpoint.get('last_index', 0) + 1
-            results = checkpoint.get('results', [])
-            failed = checkpoint.get('failed', [])
-            print(f"从检查点恢复，起始索引: {start_index}")
+        done, results, failed = load_checkpoint(checkpoint_path)
+        print(f"从检查点恢复，已处理: {len(done)}")
 
     total = len(imdb_ids)
 
-    for i, imdb_id in enumerate(imdb_ids[start_index:], start=start_index):
-        print(f"\n[{i + 1}/{total}] 正在爬取: {imdb_id}")
+    with open_checkpoint(checkpoint_path) as checkpoint:
+        for i, imdb_id in enumerate(imdb_ids[start_index:], start=start_index):
+            if imdb_id in done:
+                continue
 
-        try:
-            guide = scraper.scrape(imdb_id)
+            output_path = guide_output_path(output_dir, imdb_id)
 
-            if guide:
-                # 保存单个文件
-                output_path = os.path.join(output_dir, f"{imdb_id}_parental_guide.json")
-                save_to_json(guide, output_path)
-                results.append({
-                    "imdb_id": imdb_id,
-                    "status": "success",
-                    "title": guide.title
-                })
-                print(f"✓ 成功: {guide.title}")
-            else:
-                failed.append({"imdb_id": imdb_id, "error": "scrape returned None"})
-                print(f"✗ 失败: {imdb_id}")
+            # 已有结果文件则跳过，无需请求和等待
+            existing = load_existing_guide(output_path)
+            if existing is not None:
+                record_outcome(checkpoint, results, failed, i, imdb_id, title=existing.get("title", ""), cached=True)
+                print(f"[{i + 1}/{total}] 已存在，跳过: {imdb_id}")
+                continue
 
-        except Exception as e:
-            failed.append({"imdb_id": imdb_id, "error": str(e)})
-            print(f"✗ 异常: {imdb_id} - {e}")
+            print(f"\n[{i + 1}/{total}] 正在爬取: {imdb_id}")
 
-        # 保存检查点（每10个保存一次）
-        if (i + 1) % 10 == 0:
-            with open(checkpoint_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "last_index": i,
-                    "results": results,
-                    "failed": failed
-                }, f, ensure_ascii=False, indent=2)
-            print(f"💾 检查点已保存 ({i + 1}/{total})")
-
-        # 随机化请求间隔，避免被检测
-        if i < total - 1:
-            actual_delay = delay + random.uniform(0, 2)
-            time.sleep(actual_delay)
+            try:
+                guide = scraper.scrape(imdb_id)
+
+                if guide:
+                    # 保存单个文件
+                    save_to_json(guide, output_path)
+                    record_outcome(checkpoint, results, failed, i, imdb_id, title=guide.title)
+                    print(f"✓ 成功: {guide.title}")
+                else:
+                    record_outcome(checkpoint, results, failed, i, imdb_id, error="scrape returned None")
+                    print(f"✗ 失败: {imdb_id}")
+
+            except Exception as e:
+                record_outcome(checkpoint, results, failed, i, imdb_id, error=str(e))
+                print(f"✗ 异常: {imdb_id} - {e}")
+
+    scraper.close()
 
     # 保存最终结果汇总
-    summary_path = os.path.join(output_dir, "scrape_summary.json")
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            "total": total,
-            "success": len(results),
-            "failed_count": len(failed),
-            "failed": failed
-        }, f, ensure_ascii=False, indent=2)
+    save_summary(output_dir, total, results, failed)
+
+    # 清理检查点文件
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    print(f"\n{'=' * 50}")
+    print(f"爬取完成！成功: {len(results)}, 失败: {len(failed)}")
+    print(f"结果保存在: {output_dir}")
+
+
+async def async_batch_scrape(
+    imdb_ids: list[str],
+    output_dir: str,
+    concurrency: int = 16,
+    rate: float = 2.0,
+    start_index: int = 0,
+    max_retries: int = 3,
+    chunk_size: int = 1000,
+    checkpoint_file: str = CHECKPOINT_FILE
+):
+    """
+    并发批量爬取家长指南（asyncio + httpx HTTP/2，页面解析在进程池中并行）
+
+    Args:
+        imdb_ids: IMDb ID 列表
+        output_dir: 输出目录
+        concurrency: 最大并发请求数
+        rate: 每秒最大请求数（令牌桶限速，遇到 429 自动降速）
+        start_index: 起始索引
+        max_retries: 单个页面最大重试次数
+        chunk_size: 每批 gather 的任务数，避免文件描述符耗尽
+        checkpoint_file: 检查点文件（JSONL，每处理一个电影追加一行）
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # 共享限速器和重试策略，请求通过异步 HTTP/2 客户端发出（不会打开同步客户端）
+    scraper = IMDBParentalGuideScraper(max_retries=max_retries, rate=rate)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    results = []
+    failed = []
+    done = set()
+
+    # 加载已有的检查点，跳过已处理的 ID
+    checkpoint_path = os.path.join(output_dir, checkpoint_file)
+    if os.path.exists(checkpoint_path) and start_index == 0:
+        done, results, failed = load_checkpoint(checkpoint_path)
+        print(f"从检查点恢复，已处理: {len(done)}")
+
+    total = len(imdb_ids)
+
+    async def fetch(client, i: int, imdb_id: str):
+        url = f"{scraper.BASE_URL}/title/{imdb_id}/parentalguide/"
+        async with semaphore:
+            print(f"[{i + 1}/{total}] 正在爬取: {imdb_id}")
+            response = await scraper.fetch_async(client, url)
+        if response is None:
+            raise RuntimeError(f"failed to fetch {url}")
+        html_content = response.text
+
+        # 解析是 CPU 密集型，放到进程池中避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        guide = await loop.run_in_executor(process_pool, parse_html, html_content, imdb_id, url)
+        save_to_json(guide, guide_output_path(output_dir, imdb_id))
+        return guide
+
+    async def scrape_one(client, checkpoint, i: int, imdb_id: str):
+        try:
+            guide = await fetch(client, i, imdb_id)
+        except Exception as e:
+            record_outcome(checkpoint, results, failed, i, imdb_id, error=str(e))
+            print(f"✗ 异常: {imdb_id} - {e}")
+        else:
+            record_outcome(checkpoint, results, failed, i, imdb_id, title=guide.title)
+            print(f"✓ 成功: {guide.title}")
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as process_pool, \
+            open_checkpoint(checkpoint_path) as checkpoint:
+        async with scraper.create_async_client() as client:
+            pending = []
+            skipped = 0
+            for i, imdb_id in enumerate(imdb_ids[start_index:], start=start_index):
+                if imdb_id in done:
+                    continue
+
+                # 已有结果文件则跳过
+                existing = load_existing_guide(guide_output_path(output_dir, imdb_id))
+                if existing is not None:
+                    record_outcome(
+                        checkpoint, results, failed, i, imdb_id,
+                        title=existing.get("title", ""), cached=True
+                    )
+                    skipped += 1
+                    continue
+
+                pending.append((i, imdb_id))
+
+            if skipped:
+                print(f"跳过 {skipped} 个已存在的结果文件")
+            for chunk_start in range(0, len(pending), chunk_size):
+                chunk = pending[chunk_start:chunk_start + chunk_size]
+                await asyncio.gather(
+                    *[scrape_one(client, checkpoint, i, imdb_id) for i, imdb_id in chunk],
+                    return_exceptions=True,
+                )
+
+    save_summary(output_dir, total, results, failed)
 
     # 清理检查点文件
     if os.path.exists(checkpoint_path):
@@ -136,10 +377,16 @@ def main():
         help="输出目录 (默认: ./parental_guides)"
     )
     parser.add_argument(
-        "--delay",
+        "--rate",
         type=float,
-        default=3.0,
-        help="请求间隔秒数，建议 3-5 秒 (默认: 3.0)"
+        default=2.0,
+        help="每秒最大请求数，遇到 429 时自动降速 (默认: 2.0)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="最大并发请求数，设为 1 时使用串行爬取 (默认: 16)"
     )
     parser.add_argument(
         "--start-index",
@@ -148,6 +395,8 @@ def main():
         help="起始索引，用于手动断点续爬 (默认: 0)"
     )
     args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate 必须为正数")
 
     # 获取脚本目录
     script_dir = Path(__file__).parent.absolute()
@@ -159,27 +408,40 @@ def main():
         print(f"错误: 找不到文件 {movies_path}")
         exit(1)
 
-    # 提取 IMDb IDs
-    imdb_ids = extract_imdb_ids_from_movies_ts(str(movies_path))
-    print(f"找到 {len(imdb_ids)} 部电影")
+    # 提取 IMDb IDs，去重并排序
+    raw_ids = extract_imdb_ids_from_movies_ts(str(movies_path))
+    imdb_ids = sorted(set(raw_ids))
+    print(f"找到 {len(raw_ids)} 个 imdbId，去重后 {len(imdb_ids)} 部电影")
 
     if not imdb_ids:
         print("错误: 未找到任何 imdbId")
         exit(1)
 
     # 显示预估时间
-    estimated_time = len(imdb_ids) * (args.delay + 1)  # 加上随机延迟和处理时间
+    if args.concurrency > 1:
+        estimated_time = len(imdb_ids) / args.rate
+    else:
+        estimated_time = len(imdb_ids) * max(1 / args.rate, 1.0)  # 串行时每个请求约 1 秒
     print(f"预估耗时: {estimated_time / 60:.1f} 分钟")
     print(f"输出目录: {output_dir}")
     print("-" * 50)
 
     # 开始批量爬取
-    batch_scrape(
-        imdb_ids=imdb_ids,
-        output_dir=str(output_dir),
-        delay=args.delay,
-        start_index=args.start_index
-    )
+    if args.concurrency > 1:
+        asyncio.run(async_batch_scrape(
+            imdb_ids=imdb_ids,
+            output_dir=str(output_dir),
+            concurrency=args.concurrency,
+            rate=args.rate,
+            start_index=args.start_index
+        ))
+    else:
+        batch_scrape(
+            imdb_ids=imdb_ids,
+            output_dir=str(output_dir),
+            rate=args.rate,
+            start_index=args.start_index
+        )
 
 
 if __name__ == "__main__":
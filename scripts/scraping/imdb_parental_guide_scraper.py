@@ -3,7 +3,7 @@
 IMDB Parental Guide Scraper
 Scrapes parental guide information from IMDB movie pages.
 
-This version uses regex parsing and only requires `requests` (no BeautifulSoup).
+Pages are fetched over HTTP/2 with httpx and parsed with selectolax (lexbor backend).
 
 Extracts:
 - Content rating (MPA rating)
@@ -14,38 +14,54 @@ Extracts:
 - Frightening & Intense Scenes
 """
 
+import asyncio
 import html
-import json
 import re
 import time
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
 from typing import Optional
 
-import requests
+import httpx
+import orjson
+from selectolax.lexbor import LexborHTMLParser
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception_type, stop_after_attempt
 
 
-@dataclass
+@dataclass(slots=True)
 class CertificationRating:
     """A single rating for a certification (e.g., '16' with note 'original rating')."""
     rating: str = ""
     note: str = ""
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {"rating": self.rating, "note": self.note}
 
-@dataclass
+
+@dataclass(slots=True)
 class CertificationItem:
     """Certification information for a specific country/region."""
     country: str = ""
     ratings: list[CertificationRating] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {"country": self.country, "ratings": [rating.to_dict() for rating in self.ratings]}
+
 
-@dataclass
+@dataclass(slots=True)
 class CategoryInfo:
     """Information for a single parental guide category."""
     severity: str = ""
     items: list[str] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {"severity": self.severity, "items": list(self.items)}
+
 
-@dataclass
+@dataclass(slots=True)
 class ParentalGuide:
     """Complete parental guide information for a movie."""
     imdb_id: str = ""
@@ -66,17 +82,131 @@ class ParentalGuide:
             "title": self.title,
             "url": self.url,
             "content_rating": self.content_rating,
-            "sex_nudity": asdict(self.sex_nudity),
-            "violence_gore": asdict(self.violence_gore),
-            "profanity": asdict(self.profanity),
-            "alcohol_drugs_smoking": asdict(self.alcohol_drugs_smoking),
-            "frightening_intense": asdict(self.frightening_intense),
-            "certifications": [asdict(cert) for cert in self.certifications],
+            "sex_nudity": self.sex_nudity.to_dict(),
+            "violence_gore": self.violence_gore.to_dict(),
+            "profanity": self.profanity.to_dict(),
+            "alcohol_drugs_smoking": self.alcohol_drugs_smoking.to_dict(),
+            "frightening_intense": self.frightening_intense.to_dict(),
+            "certifications": [cert.to_dict() for cert in self.certifications],
         }
 
 
+class TokenBucket:
+    """
+    Token-bucket rate limiter for requests to a single host.
+
+    Tokens refill at `rate` per second up to `burst`. When the host throttles us
+    the rate is halved for `penalty_seconds`; after `recovery_streak` consecutive
+    successes it is ratcheted back up towards the base rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        burst: int = 4,
+        min_rate: float = 0.1,
+        penalty_seconds: float = 60.0,
+        recovery_streak: int = 20,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.penalty_seconds = penalty_seconds
+        self.recovery_streak = recovery_streak
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.penalty_until = 0.0
+        self.streak = 0
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token.
+
+        Returns:
+            Seconds the caller must wait before sending its request.
+        """
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def consume(self) -> None:
+        """Take a token, blocking until it is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def throttle(self) -> None:
+        """
+        Halve the rate after the host signalled rate limiting (HTTP 429).
+
+        429s arriving within the penalty window come from requests already in
+        flight when the rate was lowered, so they do not halve it again.
+        """
+        self.streak = 0
+        if time.monotonic() < self.penalty_until:
+            return
+        self._refill()
+        self.rate = max(self.rate / 2, self.min_rate)
+        self.penalty_until = time.monotonic() + self.penalty_seconds
+
+    def success(self) -> None:
+        """Record a successful response; ratchet the rate back up after a streak."""
+        self.streak += 1
+        if (
+            self.rate < self.base_rate
+            and self.streak >= self.recovery_streak
+            and time.monotonic() >= self.penalty_until
+        ):
+            self._refill()
+            self.rate = min(self.rate * 2, self.base_rate)
+            self.streak = 0
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date.
+        default: Delay to use when the header is missing or invalid.
+
+    Returns:
+        Seconds to wait before retrying.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RetryableStatusError(Exception):
+    """Raised for HTTP responses worth retrying (429 and transient server errors)."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.status_code = response.status_code
+        self.retry_after = response.headers.get("Retry-After")
+
+
 class IMDBParentalGuideScraper:
-    """Scraper for IMDB parental guide pages (regex-based, no BeautifulSoup required)."""
+    """Scraper for IMDB parental guide pages (selectolax based, no BeautifulSoup required)."""
 
     BASE_URL = "https://www.imdb.com"
     HEADERS = {
@@ -85,10 +215,12 @@ class IMDBParentalGuideScraper:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
         "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
         "Upgrade-Insecure-Requests": "1",
     }
 
+    # Statuses retried with backoff (429 also honors Retry-After)
+    RETRY_STATUSES = (429, 502, 503, 504)
+
     # Category section IDs
     CATEGORY_IDS = {
         "sex_nudity": "nudity",
@@ -98,24 +230,132 @@ class IMDBParentalGuideScraper:
         "frightening_intense": "frightening",
     }
 
-    def __init__(self, timeout: int = 30, max_retries: int = 3, retry_delay: float = 2.0):
+    # Every section ID anchor on the page, used to find section boundaries
+    SECTION_ANCHORS = (*CATEGORY_IDS.values(), "certificates")
+
+    # Matches every category anchor, severity and item in document order
+    _CATEGORY_SELECTOR = ", ".join(
+        [*map("#{}".format, SECTION_ANCHORS), ".ipc-signpost__text",
+         '[data-testid="item-html"] .ipc-html-content-inner-div']
+    )
+
+    # Precompiled patterns
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _TITLE_YEAR_RE = re.compile(r'^(.+?)\s*\(\d{4}\)')
+    _IMDB_URL_RE = re.compile(r"/title/(tt\d+)/")
+
+    # Class of the optional note following a certification rating link
+    _CERT_NOTE_CLASS = "ipc-metadata-list-item__list-content-item--subText"
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+        rate: float = 2.0,
+        burst: int = 4,
+    ):
         """
         Initialize the scraper.
 
         Args:
             timeout: Request timeout in seconds.
             max_retries: Maximum number of retry attempts.
-            retry_delay: Delay between retries in seconds.
+            retry_delay: Base delay for exponential backoff between retries in seconds.
+            rate: Maximum sustained requests per second to IMDB.
+            burst: Maximum number of requests sent back to back.
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.session = requests.Session()
-        self.session.headers.update(self.HEADERS)
+        self.rate_limiter = TokenBucket(rate=rate, burst=burst)
+        self._client: Optional[httpx.Client] = None
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        Sync HTTP/2 client, created on first request.
 
-    def _make_request(self, url: str) -> Optional[requests.Response]:
+        One HTTP/2 connection multiplexes all requests, so the TLS handshake is
+        paid once; parse-only instances never open a connection.
         """
-        Make HTTP request with retry logic.
+        if self._client is None:
+            self._client = httpx.Client(**self._client_options())
+        return self._client
+
+    def _client_options(self) -> dict:
+        """Options shared by the sync and async HTTP/2 clients."""
+        return {
+            "http2": True,
+            "follow_redirects": True,
+            "headers": self.HEADERS,
+            "limits": httpx.Limits(max_connections=4, max_keepalive_connections=4),
+            "timeout": self.timeout,
+        }
+
+    def close(self) -> None:
+        """Close the sync HTTP client if one was opened."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def create_async_client(self) -> httpx.AsyncClient:
+        """Create an HTTP/2 async client configured like the scraper's own client."""
+        return httpx.AsyncClient(**self._client_options())
+
+    def _retry_wait(self, retry_state: RetryCallState) -> float:
+        """Wait for Retry-After on 429, otherwise back off exponentially."""
+        backoff = self.retry_delay * 2 ** (retry_state.attempt_number - 1)
+        error = retry_state.outcome.exception()
+        if isinstance(error, RetryableStatusError) and error.status_code == 429:
+            return parse_retry_after(error.retry_after, backoff)
+        return backoff
+
+    def _log_retry(self, retry_state: RetryCallState) -> None:
+        """Print the reason for a retry."""
+        print(
+            f"{retry_state.outcome.exception()}. "
+            f"Attempt {retry_state.attempt_number}/{self.max_retries + 1}"
+        )
+
+    def _retrying(self, retrying_cls):
+        """Build a tenacity retry controller (Retrying or AsyncRetrying)."""
+        return retrying_cls(
+            stop=stop_after_attempt(self.max_retries + 1),
+            wait=self._retry_wait,
+            retry=retry_if_exception_type((httpx.TransportError, RetryableStatusError)),
+            before_sleep=self._log_retry,
+            reraise=True,
+        )
+
+    def _check_response(self, response: httpx.Response) -> Optional[httpx.Response]:
+        """
+        Update the rate limiter from a response.
+
+        Raises:
+            RetryableStatusError: On 429 or a transient server error.
+
+        Returns:
+            The response if successful, None otherwise.
+        """
+        if response.status_code == 429:
+            self.rate_limiter.throttle()
+            raise RetryableStatusError(response)
+        if response.status_code in self.RETRY_STATUSES:
+            raise RetryableStatusError(response)
+
+        if response.status_code == 200:
+            self.rate_limiter.success()
+            return response
+        elif response.status_code == 403:
+            print("Access forbidden (403).")
+        else:
+            print(f"HTTP {response.status_code}.")
+        return None
+
+    def _make_request(self, url: str) -> Optional[httpx.Response]:
+        """
+        Make rate-limited HTTP request with retry logic.
 
         Args:
             url: The URL to request.
@@ -123,24 +363,33 @@ class IMDBParentalGuideScraper:
         Returns:
             Response object if successful, None otherwise.
         """
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.get(url, timeout=self.timeout)
-                if response.status_code == 200:
-                    return response
-                elif response.status_code == 403:
-                    print(f"Access forbidden (403). Attempt {attempt + 1}/{self.max_retries}")
-                elif response.status_code == 429:
-                    print(f"Rate limited (429). Waiting longer...")
-                    time.sleep(self.retry_delay * (attempt + 2))
-                else:
-                    print(f"HTTP {response.status_code}. Attempt {attempt + 1}/{self.max_retries}")
-            except requests.RequestException as e:
-                print(f"Request failed: {e}. Attempt {attempt + 1}/{self.max_retries}")
-
-            if attempt < self.max_retries - 1:
-                time.sleep(self.retry_delay * (attempt + 1))
+        try:
+            for attempt in self._retrying(Retrying):
+                with attempt:
+                    self.rate_limiter.consume()
+                    return self._check_response(self.client.get(url))
+        except (httpx.HTTPError, RetryableStatusError) as e:
+            print(f"Request failed after {self.max_retries} retries: {e}")
+        return None
 
+    async def fetch_async(self, client: httpx.AsyncClient, url: str) -> Optional[httpx.Response]:
+        """
+        Async counterpart of _make_request, sharing its rate limiter and retry policy.
+
+        Args:
+            client: Client from create_async_client.
+            url: The URL to request.
+
+        Returns:
+            Response object if successful, None otherwise.
+        """
+        try:
+            async for attempt in self._retrying(AsyncRetrying):
+                with attempt:
+                    await asyncio.sleep(self.rate_limiter.reserve())
+                    return self._check_response(await client.get(url))
+        except (httpx.HTTPError, RetryableStatusError) as e:
+            print(f"Request failed after {self.max_retries} retries: {e}")
         return None
 
     def _decode_html_entities(self, text: str) -> str:
@@ -150,133 +399,89 @@ class IMDBParentalGuideScraper:
     def _clean_text(self, text: str) -> str:
         """Clean extracted text from HTML."""
         # Decode HTML entities
-        text = self._decode_html_entities(text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        if "&" in text:
+            text = self._decode_html_entities(text)
+        # Collapse whitespace runs; most items have only single spaces, and any other
+        # whitespace character (newline, tab, nbsp, ...) is non-printable
+        if "  " in text or not text.isprintable():
+            text = self._WHITESPACE_RE.sub(' ', text)
         return text.strip()
 
-    def _extract_title(self, html_content: str) -> str:
-        """Extract movie title from the page."""
-        # Try to get subtitle (movie name)
-        match = re.search(r'data-testid="subtitle"[^>]*>([^<]+)', html_content)
-        if match:
-            return self._clean_text(match.group(1))
-
-        # Fallback: extract from page title
-        match = re.search(r'<title>([^<]+)</title>', html_content)
-        if match:
-            title_text = match.group(1)
-            title_match = re.search(r'^(.+?)\s*\(\d{4}\)', title_text)
-            if title_match:
-                return self._clean_text(title_match.group(1))
-        return ""
+    def _node_text(self, node) -> str:
+        """Clean the text of a parsed node, or return '' if it is missing."""
+        if node is None:
+            return ""
+        return self._clean_text(node.text())
 
-    def _extract_content_rating(self, html_content: str) -> str:
-        """Extract content rating (MPA rating) from the page."""
-        # Find the content-rating section
-        section_match = re.search(
-            r'data-testid="content-rating".*?Motion Picture Rating.*?'
-            r'ipc-html-content-inner-div[^>]*>([^<]+)',
-            html_content,
-            re.DOTALL
-        )
-        if section_match:
-            return self._clean_text(section_match.group(1))
-        return ""
+    def _select_title(self, tree) -> str:
+        """Extract movie title from the parsed page."""
+        title = self._node_text(tree.css_first('[data-testid="subtitle"]'))
+        if title:
+            return title
 
-    def _find_section_content(self, html_content: str, section_id: str) -> str:
-        """Find the content of a specific section by ID."""
-        # Find the section starting from its ID anchor
-        pattern = rf'id="{section_id}".*?(?=id="(?:nudity|violence|profanity|alcohol|frightening|certificates)"|$)'
-        match = re.search(pattern, html_content, re.DOTALL)
-        if match:
-            return match.group(0)
+        # Fallback: extract from page title
+        title_match = self._TITLE_YEAR_RE.search(self._node_text(tree.css_first("title")))
+        if title_match:
+            return self._clean_text(title_match.group(1))
         return ""
 
-    def _extract_category_severity(self, html_content: str, section_id: str) -> str:
-        """Extract severity level for a category."""
-        section_content = self._find_section_content(html_content, section_id)
-        if not section_content:
+    def _select_content_rating(self, tree) -> str:
+        """Extract content rating (MPA rating) from the parsed page."""
+        section = tree.css_first('[data-testid="content-rating"]')
+        if section is None or "Motion Picture Rating" not in section.text():
             return ""
+        return self._node_text(section.css_first(".ipc-html-content-inner-div"))
 
-        # Find severity in the signpost text
-        match = re.search(r'ipc-signpost__text[^>]*>([^<]+)', section_content)
-        if match:
-            return self._clean_text(match.group(1))
-        return ""
-
-    def _extract_category_items(self, html_content: str, section_id: str) -> list[str]:
-        """Extract all items for a category."""
-        items = []
-        section_content = self._find_section_content(html_content, section_id)
-        if not section_content:
-            return items
-
-        # Find all item-html content divs
-        # Pattern: data-testid="item-html" followed by inner-div with content
-        pattern = r'data-testid="item-html".*?ipc-html-content-inner-div[^>]*>([^<]+)'
-        matches = re.findall(pattern, section_content, re.DOTALL)
-        for match in matches:
-            text = self._clean_text(match)
-            if text:
-                items.append(text)
-
-        return items
-
-    def _extract_category(self, html_content: str, section_id: str) -> CategoryInfo:
-        """Extract complete information for a category."""
-        return CategoryInfo(
-            severity=self._extract_category_severity(html_content, section_id),
-            items=self._extract_category_items(html_content, section_id),
-        )
-
-    def _extract_certifications(self, html_content: str) -> list[CertificationItem]:
-        """Extract certifications (country ratings) from the page."""
-        certifications = []
-
-        # Find the certificates section (from container to end of section or footer)
-        cert_section_match = re.search(
-            r'data-testid="certificates-container"(.*?)(?:</section>|<footer)',
-            html_content,
-            re.DOTALL
-        )
-        if not cert_section_match:
-            return certifications
-
-        cert_section = cert_section_match.group(0)
+    def _select_categories(self, tree) -> dict[str, CategoryInfo]:
+        """
+        Extract every category from the parsed page, keyed by section ID.
 
-        # Split by certificates-item to get each country block
-        # Use lookahead to keep the delimiter
-        country_blocks = re.split(r'(?=data-testid="certificates-item")', cert_section)
+        Each category runs from its ID anchor to the next known anchor, as
+        categories may share one <section>; a single document-order walk over
+        the anchors, severities and items assigns each node to its category.
+        """
+        categories = {}
+        current = None
+        for node in tree.css(self._CATEGORY_SELECTOR):
+            section_id = node.attributes.get("id")
+            if section_id in self.SECTION_ANCHORS:
+                current = categories.setdefault(section_id, CategoryInfo())
+                continue
+            if current is None:
+                continue
 
-        for block in country_blocks:
-            if 'certificates-item' not in block:
+            text = self._node_text(node)
+            if not text:
                 continue
+            if "ipc-signpost__text" in (node.attributes.get("class") or ""):
+                if not current.severity:
+                    current.severity = text
+            else:
+                current.items.append(text)
+
+        return categories
 
-            # Extract country name
-            country_match = re.search(
-                r'ipc-metadata-list-item__label[^>]*>([^<]+)',
-                block
-            )
-            country = self._clean_text(country_match.group(1)) if country_match else ""
+    def _select_certifications(self, tree) -> list[CertificationItem]:
+        """Extract certifications (country ratings) from the parsed page."""
+        certifications = []
 
+        for block in tree.css('[data-testid="certificates-item"]'):
+            country = self._node_text(block.css_first(".ipc-metadata-list-item__label"))
             if not country:
                 continue
 
-            # Extract all ratings for this country
             ratings = []
-            # Pattern to match rating links and optional subtext
-            rating_pattern = (
-                r'ipc-metadata-list-item__list-content-item--link[^>]*>([^<]+)</a>'
-                r'(?:<span class="ipc-metadata-list-item__list-content-item--subText">([^<]*)</span>)?'
-            )
-            rating_matches = re.findall(rating_pattern, block, re.DOTALL)
-
-            for rating_match in rating_matches:
-                rating_text = self._clean_text(rating_match[0])
-                note_text = self._clean_text(rating_match[1]) if len(rating_match) > 1 else ""
-                if rating_text:
-                    ratings.append(CertificationRating(rating=rating_text, note=note_text))
+            for link in block.css(".ipc-metadata-list-item__list-content-item--link"):
+                rating_text = self._node_text(link)
+                if not rating_text:
+                    continue
+
+                # The optional note is a subtext <span> right after the link
+                note_node = link.next
+                note_text = ""
+                if note_node is not None and self._CERT_NOTE_CLASS in (note_node.attributes.get("class") or ""):
+                    note_text = self._node_text(note_node)
+                ratings.append(CertificationRating(rating=rating_text, note=note_text))
 
             if ratings:
                 certifications.append(CertificationItem(country=country, ratings=ratings))
@@ -305,23 +510,38 @@ class IMDBParentalGuideScraper:
             print(f"Failed to fetch page for {imdb_id}")
             return None
 
-        html_content = response.text
+        return self.parse(response.text, imdb_id, url)
 
-        guide = ParentalGuide(
+    def parse(self, html_content: str, imdb_id: str, url: str) -> ParentalGuide:
+        """
+        Build a ParentalGuide from an already-fetched parental guide page.
+
+        Parsing is independent of how the page was fetched, so async
+        fetchers can reuse it.
+
+        Args:
+            html_content: Raw HTML of the parental guide page.
+            imdb_id: IMDB title ID the page belongs to.
+            url: URL the page was fetched from.
+
+        Returns:
+            ParentalGuide object.
+        """
+        tree = LexborHTMLParser(html_content)
+        categories = self._select_categories(tree)
+        return ParentalGuide(
             imdb_id=imdb_id,
             url=url,
-            title=self._extract_title(html_content),
-            content_rating=self._extract_content_rating(html_content),
-            sex_nudity=self._extract_category(html_content, self.CATEGORY_IDS["sex_nudity"]),
-            violence_gore=self._extract_category(html_content, self.CATEGORY_IDS["violence_gore"]),
-            profanity=self._extract_category(html_content, self.CATEGORY_IDS["profanity"]),
-            alcohol_drugs_smoking=self._extract_category(html_content, self.CATEGORY_IDS["alcohol_drugs_smoking"]),
-            frightening_intense=self._extract_category(html_content, self.CATEGORY_IDS["frightening_intense"]),
-            certifications=self._extract_certifications(html_content),
+            title=self._select_title(tree),
+            content_rating=self._select_content_rating(tree),
+            sex_nudity=categories.get(self.CATEGORY_IDS["sex_nudity"], CategoryInfo()),
+            violence_gore=categories.get(self.CATEGORY_IDS["violence_gore"], CategoryInfo()),
+            profanity=categories.get(self.CATEGORY_IDS["profanity"], CategoryInfo()),
+            alcohol_drugs_smoking=categories.get(self.CATEGORY_IDS["alcohol_drugs_smoking"], CategoryInfo()),
+            frightening_intense=categories.get(self.CATEGORY_IDS["frightening_intense"], CategoryInfo()),
+            certifications=self._select_certifications(tree),
         )
 
-        return guide
-
     def scrape_from_url(self, url: str) -> Optional[ParentalGuide]:
         """
         Scrape parental guide from a full URL.
@@ -333,7 +553,7 @@ class IMDBParentalGuideScraper:
             ParentalGuide object if successful, None otherwise.
         """
         # Extract IMDB ID from URL
-        match = re.search(r"/title/(tt\d+)/", url)
+        match = self._IMDB_URL_RE.search(url)
         if not match:
             print(f"Invalid IMDB URL: {url}")
             return None
@@ -341,6 +561,32 @@ class IMDBParentalGuideScraper:
         return self.scrape(match.group(1))
 
 
+# Per-process scraper used by parse_html
+_parser: Optional[IMDBParentalGuideScraper] = None
+
+
+def parse_html(html_content: str, imdb_id: str, url: str) -> ParentalGuide:
+    """
+    Parse an already-fetched parental guide page.
+
+    Module-level so it can run in worker processes (e.g. a ProcessPoolExecutor);
+    each process creates one scraper instance for its parsing helpers, which
+    never opens an HTTP connection.
+
+    Args:
+        html_content: Raw HTML of the parental guide page.
+        imdb_id: IMDB title ID the page belongs to.
+        url: URL the page was fetched from.
+
+    Returns:
+        ParentalGuide object.
+    """
+    global _parser
+    if _parser is None:
+        _parser = IMDBParentalGuideScraper()
+    return _parser.parse(html_content, imdb_id, url)
+
+
 def save_to_json(guide: ParentalGuide, output_path: str) -> None:
     """
     Save parental guide to JSON file.
@@ -349,8 +595,8 @@ def save_to_json(guide: ParentalGuide, output_path: str) -> None:
         guide: ParentalGuide object to save.
         output_path: Output file path.
     """
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(guide.to_dict(), f, ensure_ascii=False, indent=2)
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(guide.to_dict(), option=orjson.OPT_INDENT_2))
     print(f"Saved to: {output_path}")
 
 
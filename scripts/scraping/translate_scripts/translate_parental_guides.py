@@ -5,27 +5,37 @@
 """
 
 import argparse
+import asyncio
+import contextlib
 import json
 import os
 import sys
-import time
 from pathlib import Path
 from typing import Optional
 
-# 延迟导入 openai，允许 --dry-run 和 --help 在未安装时使用
-OpenAI = None
+# 延迟导入 openai / tenacity / orjson，允许 --dry-run 和 --help 在未安装时使用
+AsyncOpenAI = None
+httpx = None
+orjson = None
+tenacity = None
 
 
-def ensure_openai():
-    """确保 openai 库已安装"""
-    global OpenAI
-    if OpenAI is None:
+def ensure_dependencies():
+    """确保 openai、tenacity 和 orjson 库已安装"""
+    global AsyncOpenAI, httpx, orjson, tenacity
+    if AsyncOpenAI is None:
         try:
-            from openai import OpenAI as _OpenAI
-
-            OpenAI = _OpenAI
+            import httpx as _httpx
+            import orjson as _orjson
+            import tenacity as _tenacity
+            from openai import AsyncOpenAI as _AsyncOpenAI
+
+            AsyncOpenAI = _AsyncOpenAI
+            httpx = _httpx
+            orjson = _orjson
+            tenacity = _tenacity
         except ImportError:
-            print("请先安装 openai 库: pip install openai")
+            print("请先安装依赖: pip install openai tenacity orjson")
             sys.exit(1)
 
 
@@ -48,19 +58,77 @@ SYSTEM_PROMPT = """你是一个专业的电影内容翻译专家。请将以下
 4. 保持原文的分条格式，每条翻译对应原文的一条
 5. 只返回翻译结果，不要添加额外的解释或编号"""
 
+# 批量翻译提示词：一次请求翻译多个类别
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+输入是一个 JSON 对象，键为类别名，值为待翻译的英文条目数组。
+请返回一个 JSON 对象，键与输入完全相同，值为对应的中文译文数组，译文与原文条目一一对应。"""
+
+# 单次批量请求的原文字符上限，超出时拆分为多个请求，避免超出模型上下文
+MAX_BATCH_CHARS = 8000
+
 
-def create_client(api_base: str, api_key: str) -> OpenAI:
-    """创建 OpenAI 客户端"""
-    return OpenAI(base_url=api_base, api_key=api_key)
+def create_client(api_base: str, api_key: str) -> AsyncOpenAI:
+    """创建异步 OpenAI 客户端，复用 keep-alive 连接池"""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    )
+    return AsyncOpenAI(base_url=api_base, api_key=api_key, http_client=http_client)
+
+
+def retrying(label: str, max_retries: int):
+    """指数退避重试 (2s, 4s, ...)，每次失败时打印原因"""
+    return tenacity.AsyncRetrying(
+        stop=tenacity.stop_after_attempt(max_retries),
+        wait=tenacity.wait_exponential(multiplier=2),
+        before_sleep=lambda state: print(
+            f"  {label}失败 (尝试 {state.attempt_number}/{max_retries}): "
+            f"{state.outcome.exception()}"
+        ),
+        reraise=True,
+    )
 
 
-def translate_items(
-    client: OpenAI,
+async def stream_items(
+    client: AsyncOpenAI,
+    model: str,
+    user_prompt: str,
+) -> list[str]:
+    """流式接收译文，每收到一个 --- 分隔符就切出一条已完成的译文"""
+    translated_items = []
+    buffer = ""
+
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.3,
+        stream=True,
+    )
+    # 读完后立即关闭响应，释放连接
+    async with stream:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            buffer += chunk.choices[0].delta.content or ""
+            *completed, buffer = buffer.split("---")
+            translated_items.extend(item.strip() for item in completed if item.strip())
+
+    if buffer.strip():
+        translated_items.append(buffer.strip())
+    return translated_items
+
+
+async def translate_items(
+    client: AsyncOpenAI,
     items: list[str],
     model: str,
     max_retries: int = 3,
+    semaphore: Optional[asyncio.Semaphore] = None,
 ) -> Optional[list[str]]:
-    """翻译 items 列表"""
+    """翻译 items 列表，semaphore 用于限制同时进行的 API 请求数"""
     if not items:
         return []
 
@@ -68,56 +136,137 @@ def translate_items(
     items_text = "\n---\n".join(items)
     user_prompt = f"请翻译以下{len(items)}条内容，每条用 --- 分隔：\n\n{items_text}"
 
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.3,
-            )
-
-            translated_text = response.choices[0].message.content.strip()
-            translated_items = [
-                item.strip() for item in translated_text.split("---") if item.strip()
-            ]
-
-            # 验证翻译数量是否匹配
-            if len(translated_items) != len(items):
-                print(
-                    f"  警告: 翻译数量不匹配 (原文 {len(items)} 条, 翻译 {len(translated_items)} 条)"
-                )
-                # 尝试修复：如果翻译少了，用原文补齐；如果多了，截断
-                if len(translated_items) < len(items):
-                    translated_items.extend(items[len(translated_items) :])
-                else:
-                    translated_items = translated_items[: len(items)]
-
-            return translated_items
+    try:
+        async for attempt in retrying("翻译", max_retries):
+            with attempt:
+                async with semaphore or contextlib.nullcontext():
+                    translated_items = await stream_items(client, model, user_prompt)
+    except Exception as e:
+        print(f"  翻译失败 (已尝试 {max_retries} 次): {e}")
+        return None
 
-        except Exception as e:
-            print(f"  翻译失败 (尝试 {attempt + 1}/{max_retries}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))  # 指数退避
+    # 验证翻译数量是否匹配
+    if len(translated_items) != len(items):
+        print(
+            f"  警告: 翻译数量不匹配 (原文 {len(items)} 条, 翻译 {len(translated_items)} 条)"
+        )
+        # 尝试修复：如果翻译少了，用原文补齐；如果多了，截断
+        if len(translated_items) < len(items):
+            translated_items.extend(items[len(translated_items) :])
+        else:
+            translated_items = translated_items[: len(items)]
+
+    return translated_items
+
+
+def split_batches(
+    items_by_cat: dict[str, list[str]],
+    max_chars: int = MAX_BATCH_CHARS,
+) -> list[dict[str, list[str]]]:
+    """按原文长度将各类别条目拆分为多个批次，保持条目顺序"""
+    batches = []
+    current: dict[str, list[str]] = {}
+    size = 0
+
+    for category, items in items_by_cat.items():
+        for item in items:
+            if current and size + len(item) > max_chars:
+                batches.append(current)
+                current = {}
+                size = 0
+            current.setdefault(category, []).append(item)
+            size += len(item)
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def translate_batch(
+    client: AsyncOpenAI,
+    batch: dict[str, list[str]],
+    model: str,
+    max_retries: int = 3,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Optional[dict[str, list[str]]]:
+    """用一次 JSON 格式请求翻译多个类别的条目"""
+    user_prompt = json.dumps(batch, ensure_ascii=False)
+
+    try:
+        async for attempt in retrying("批量翻译", max_retries):
+            with attempt:
+                async with semaphore or contextlib.nullcontext():
+                    response = await client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        temperature=0.3,
+                        response_format={"type": "json_object"},
+                    )
+
+                translated = json.loads(response.choices[0].message.content)
+                if not isinstance(translated, dict):
+                    raise ValueError("返回结果不是 JSON 对象")
+    except Exception as e:
+        print(f"  批量翻译失败 (已尝试 {max_retries} 次): {e}")
+        return None
+
+    return translated
+
+
+async def translate_all_categories(
+    client: AsyncOpenAI,
+    items_by_cat: dict[str, list[str]],
+    model: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> dict[str, list[str]]:
+    """
+    将一个文件所有类别的条目合并为尽量少的请求翻译
+
+    返回翻译成功的类别；批量结果缺失或数量不匹配的类别回退为逐类别翻译
+    """
+    results: dict[str, list[str]] = {category: [] for category in items_by_cat}
+    failed: set[str] = set()
 
-    return None
+    for batch in split_batches(items_by_cat):
+        translated = await translate_batch(client, batch, model, semaphore=semaphore) or {}
 
+        for category, items in batch.items():
+            if category in failed:
+                continue
 
-def translate_file(
-    client: OpenAI,
+            part = translated.get(category)
+            if (
+                not isinstance(part, list)
+                or len(part) != len(items)
+                or not all(isinstance(item, str) for item in part)
+            ):
+                part = await translate_items(client, items, model, semaphore=semaphore)
+
+            if part is None:
+                failed.add(category)
+            else:
+                results[category].extend(item.strip() for item in part)
+
+    return {category: items for category, items in results.items() if category not in failed}
+
+
+async def translate_file(
+    client: AsyncOpenAI,
     file_path: Path,
     model: str,
     force: bool = False,
-    delay: float = 0.5,
+    semaphore: Optional[asyncio.Semaphore] = None,
 ) -> bool:
     """翻译单个文件"""
+    name = file_path.name
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(file_path, "rb") as f:
+            data = orjson.loads(f.read())
     except Exception as e:
-        print(f"  读取文件失败: {e}")
+        print(f"  {name}: 读取文件失败: {e}")
         return False
 
     # 检查是否已翻译
@@ -127,10 +276,11 @@ def translate_file(
             for cat in CATEGORIES
         )
         if has_translation:
-            print(f"  跳过 (已翻译)")
+            print(f"  {name}: 跳过 (已翻译)")
             return True
 
     modified = False
+    pending: dict[str, list[str]] = {}
 
     for category in CATEGORIES:
         if category not in data:
@@ -147,28 +297,66 @@ def translate_file(
         if not force and "items_zh" in cat_data and cat_data["items_zh"]:
             continue
 
-        print(f"  翻译 {category} ({len(items)} 条)...")
-        translated = translate_items(client, items, model)
+        pending[category] = items
 
-        if translated is not None:
-            cat_data["items_zh"] = translated
-            modified = True
-            time.sleep(delay)  # 请求间隔
-        else:
-            print(f"  {category} 翻译失败")
+    if pending:
+        summary = ", ".join(f"{category} ({len(items)} 条)" for category, items in pending.items())
+        print(f"  {name}: 翻译 {summary}...")
+        translated = await translate_all_categories(client, pending, model, semaphore=semaphore)
+
+        for category in pending:
+            if category in translated:
+                data[category]["items_zh"] = translated[category]
+                modified = True
+            else:
+                print(f"  {name}: {category} 翻译失败")
 
     if modified:
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             return True
         except Exception as e:
-            print(f"  写入文件失败: {e}")
+            print(f"  {name}: 写入文件失败: {e}")
             return False
 
     return True
 
 
+async def main_async(args: argparse.Namespace, files: list[Path]):
+    """并发翻译所有文件"""
+    client = create_client(args.api_base, args.api_key)
+
+    # 所有任务共享，限制同时进行的 API 请求数
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run(file_path: Path) -> tuple[Path, bool]:
+        try:
+            ok = await translate_file(client, file_path, args.model, args.force, semaphore)
+        except Exception as e:
+            print(f"  {file_path.name}: 翻译异常: {e}")
+            ok = False
+        return file_path, ok
+
+    success_count = 0
+    fail_count = 0
+
+    try:
+        tasks = [run(file_path) for file_path in files]
+        for i, task in enumerate(asyncio.as_completed(tasks), 1):
+            file_path, ok = await task
+            if ok:
+                success_count += 1
+            else:
+                fail_count += 1
+            print(f"[{i}/{len(files)}] {file_path.name} {'完成' if ok else '失败'}")
+    finally:
+        await client.close()
+
+    print()
+    print(f"完成: 成功 {success_count}, 失败 {fail_count}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="翻译家长指南内容")
     parser.add_argument(
@@ -192,10 +380,10 @@ def main():
         help="强制重新翻译已翻译的文件",
     )
     parser.add_argument(
-        "--delay",
-        type=float,
-        default=0.5,
-        help="请求间隔秒数 (默认: 0.5)",
+        "--concurrency",
+        type=int,
+        default=8,
+        help="API 并发请求上限 (默认: 8)",
     )
     parser.add_argument(
         "--file",
@@ -240,25 +428,10 @@ def main():
             print(f"  {f.name}")
         return
 
-    # 确保 openai 库已安装（仅在实际翻译时需要）
-    ensure_openai()
-
-    # 创建客户端
-    client = create_client(args.api_base, args.api_key)
+    # 确保依赖已安装（仅在实际翻译时需要）
+    ensure_dependencies()
 
-    success_count = 0
-    fail_count = 0
-
-    for i, file_path in enumerate(files, 1):
-        print(f"[{i}/{len(files)}] {file_path.name}")
-
-        if translate_file(client, file_path, args.model, args.force, args.delay):
-            success_count += 1
-        else:
-            fail_count += 1
-
-    print()
-    print(f"完成: 成功 {success_count}, 失败 {fail_count}")
+    asyncio.run(main_async(args, files))
 
 
 if __name__ == "__main__":